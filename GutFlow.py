@@ -5,25 +5,39 @@
 # stage tick tracking. Preserves original structure as much as possible; changes
 # are clearly marked and minimal where feasible.
 # GPT 4o, LloydLewis, SezaRSaeed
-from dataclasses import dataclass
+from dataclasses import dataclass, field, fields, replace, InitVar
+from enum import IntEnum
+import argparse
+import hashlib
+import inspect
+import itertools
 import time
+import os
 import sys
 import threading
 import queue
-from typing import Dict, Optional, List
+from typing import Dict, Optional, List, Tuple
+
+import numpy as np
+
+# Non-blocking stdin: select() on POSIX, msvcrt keyboard polling on Windows
+try:
+    import msvcrt
+except ImportError:
+    msvcrt = None
+    import select
 
 # Optional rich UI
 try:
     from rich.live import Live
-    from rich.console import Console
+    from rich.console import Console, Group
     from rich.table import Table
     from rich.panel import Panel
     from rich.progress import Progress, BarColumn, TextColumn, SpinnerColumn, TimeElapsedColumn
     from rich.align import Align
-    from rich.layout import Layout
     from rich.box import SIMPLE
 except Exception:
-    Console = Live = Table = Panel = Progress = Align = Layout = None
+    Console = Group = Live = Table = Panel = Progress = Align = None
 
 # Shorter timers for faster demo runs
 TIME_MAP = {
@@ -33,6 +47,139 @@ TIME_MAP = {
     "LargeIntestine": 36   # ~ reduced from 72
 }
 
+# Hormone levels are small ints so stage logic compares integers, not strings
+class H(IntEnum):
+    LOW = 0
+    NORMAL = 1
+    SLIGHT = 2
+    HIGH = 3
+    IMPAIRED = 4
+
+
+_LEVEL_NAMES = tuple(level.name.title() for level in H)
+
+
+@dataclass(slots=True)
+class Hormones:
+    parasympathetic_stim: int = H.NORMAL
+    gastrin: int = H.NORMAL
+    ghrelin: int = H.NORMAL
+    insulin: int = H.NORMAL
+    leptin: int = H.NORMAL
+
+    def str_view(self) -> Tuple[Tuple[str, str], ...]:
+        # (name, 'High'/'Low'/...) pairs; only the renderer needs the strings
+        return tuple((name, _LEVEL_NAMES[getattr(self, name)]) for name in HORMONE_NAMES)
+
+
+HORMONE_NAMES = tuple(f.name for f in fields(Hormones))
+# BodyBatch.hormones columns, in HORMONE_NAMES order
+PARASYM, GASTRIN, GHRELIN, INSULIN, LEPTIN = range(len(HORMONE_NAMES))
+
+
+# Nutrient vector layout shared by Food and the kernels below
+CARBS, PROTEINS, FATS, FIBER = range(4)
+_ABSORPTION_RATES = np.array([0.95, 0.9, 0.85], dtype=np.float64)
+_KCAL_CARBS, _KCAL_PROTEIN, _KCAL_FAT = 4.0, 4.0, 9.0
+_KCAL_PER_G = np.array([_KCAL_CARBS, _KCAL_PROTEIN, _KCAL_FAT], dtype=np.float64)
+
+# Model constants shared by the scalar kernels/organs and the vectorized BodyBatch
+_FIBER_GOOD_GAIN, _FIBER_BAD_LOSS = 1.2, 0.6  # per tick while fiber is present
+_ANTIBIOTIC_GOOD_LOSS, _ANTIBIOTIC_BAD_LOSS = 5.0, 2.0  # per tick on antibiotics
+_GLYCOGEN_SHARE, _GLYCOGEN_CAP = 0.6, 100.0
+_FAT_STORE_SHARE, _PROTEIN_USE_SHARE = 0.7, 0.8
+
+# ---- Numeric kernels ----
+# Pure scalar math only: callers unpack dataclasses/dicts and pass primitives in,
+# so numba can compile these once (cached on disk) and run them natively.
+def _micro_tick(good, bad, fiber, antibiotic_flag):
+    # fiber supports good bacteria
+    if fiber > 0:
+        good = min(100.0, good + _FIBER_GOOD_GAIN)
+        bad = bad - _FIBER_BAD_LOSS if bad > _FIBER_BAD_LOSS else 0.0
+    # antibiotics harm microbiome
+    if antibiotic_flag:
+        good = good - _ANTIBIOTIC_GOOD_LOSS if good > _ANTIBIOTIC_GOOD_LOSS else 0.0
+        bad = bad - _ANTIBIOTIC_BAD_LOSS if bad > _ANTIBIOTIC_BAD_LOSS else 0.0
+    # re-normalize
+    total = good + bad
+    if total > 0:
+        good = (good / total) * 100
+        bad = (bad / total) * 100
+    return good, bad
+
+
+def _absorb(nutrients, malabs, ins_res):
+    # one vector multiply over [carbs, proteins, fats]; returns (absorbed grams, kcal).
+    # Grams and factors are all non-negative, so no clamp is needed
+    absorbed = nutrients[:3] * _ABSORPTION_RATES * malabs
+    kcal = (absorbed * _KCAL_PER_G).sum() * ins_res
+    return absorbed, kcal
+
+
+def _metabolize(carbs, prot, fats):
+    # simple partition: carbs -> glycogen, fats -> stored fat, proteins -> used
+    glycogen = min(_GLYCOGEN_CAP, carbs * _GLYCOGEN_SHARE)
+    fat_storage = fats * _FAT_STORE_SHARE
+    protein_use = prot * _PROTEIN_USE_SHARE
+    energy_added = glycogen * _KCAL_CARBS + protein_use * _KCAL_PROTEIN + fat_storage * _KCAL_FAT
+    return glycogen, fat_storage, protein_use, energy_added
+
+
+# numba signatures, shared by the JIT below and the AOT build in compile_kernels.py
+KERNEL_SIGNATURES = {
+    '_micro_tick': 'UniTuple(f8, 2)(f8, f8, f8, i1)',
+    '_absorb': 'Tuple((f8[::1], f8))(Array(f8, 1, "C", readonly=True), f8, f8)',
+    '_metabolize': 'UniTuple(f8, 4)(f8, f8, f8)',
+}
+
+
+def _kernel_fingerprint() -> int:
+    # Hash of the kernel sources, their signatures and the module constants numba
+    # folds into the machine code. compile_kernels.py bakes it into the AOT build,
+    # so an extension built from older kernels or constants can be told apart.
+    digest = hashlib.sha256()
+    for name, signature in KERNEL_SIGNATURES.items():
+        kernel = globals()[name]
+        digest.update(inspect.getsource(kernel).encode())
+        digest.update(signature.encode())
+        for ref in kernel.__code__.co_names:
+            value = globals().get(ref)
+            if isinstance(value, np.ndarray):
+                digest.update(value.dtype.str.encode() + value.tobytes())
+            elif isinstance(value, (int, float, tuple)):
+                digest.update(f'{ref}={value!r}'.encode())
+    # positive and within int64, the AOT export's return type
+    return int.from_bytes(digest.digest()[:8], 'little') >> 1
+
+
+KERNEL_FINGERPRINT = _kernel_fingerprint()
+
+# Prefer the ahead-of-time build (python compile_kernels.py) so startup pays no JIT cost;
+# otherwise JIT them with numba if available, else they run as plain Python
+try:
+    import gutflow_kernels
+except ImportError:
+    gutflow_kernels = None
+if gutflow_kernels is not None and getattr(gutflow_kernels, 'fingerprint', lambda: None)() != KERNEL_FINGERPRINT:
+    print("Warning: gutflow_kernels was built from different kernels; using the JIT path. "
+          "Rebuild it with: python compile_kernels.py", file=sys.stderr)
+    gutflow_kernels = None
+if gutflow_kernels is not None:
+    _micro_tick = gutflow_kernels.micro_tick
+    _absorb = gutflow_kernels.absorb
+    _metabolize = gutflow_kernels.metabolize
+else:
+    try:
+        from numba import njit
+    except Exception:
+        pass
+    else:
+        _micro_tick = njit(KERNEL_SIGNATURES['_micro_tick'], cache=True)(_micro_tick)
+        _absorb = njit(KERNEL_SIGNATURES['_absorb'], cache=True)(_absorb)
+        _metabolize = njit(KERNEL_SIGNATURES['_metabolize'], cache=True)(_metabolize)
+
+
 # ---- Data structures ----
 @dataclass
 class Microbiome:
@@ -40,34 +187,83 @@ class Microbiome:
     bad_bacteria: float = 30.0
     fiber_intake: float = 0.0
     antibiotic: bool = False
+    # bumped on every state change; gas_production() is memoized against it
+    _version: int = field(default=0, init=False, repr=False, compare=False)
+    _cached_v: int = field(default=-1, init=False, repr=False, compare=False)
+    _cached_gas: float = field(default=0.0, init=False, repr=False, compare=False)
+    # True once a tick ran with no fiber and no antibiotic: the populations are
+    # renormalized and nothing moves them, so further ticks would be no-ops
+    _steady: bool = field(default=False, init=False, repr=False, compare=False)
+
+    @property
+    def needs_tick(self) -> bool:
+        return self.antibiotic or not self._steady
+
+    def feed(self, fiber: float) -> None:
+        if fiber != self.fiber_intake:
+            self.fiber_intake = fiber
+            self._steady = False
+            self._version += 1
 
     def tick(self):
-        # fiber supports good bacteria
-        if self.fiber_intake > 0:
-            self.good_bacteria = min(100.0, self.good_bacteria + 1.2)
-            self.bad_bacteria = max(0.0, self.bad_bacteria - 0.6)
-        # antibiotics harm microbiome
-        if self.antibiotic:
-            self.good_bacteria = max(0.0, self.good_bacteria - 5.0)
-            self.bad_bacteria = max(0.0, self.bad_bacteria - 2.0)
-        # re-normalize
-        total = self.good_bacteria + self.bad_bacteria
-        if total > 0:
-            self.good_bacteria = (self.good_bacteria / total) * 100
-            self.bad_bacteria = (self.bad_bacteria / total) * 100
+        self.good_bacteria, self.bad_bacteria = _micro_tick(
+            self.good_bacteria, self.bad_bacteria, self.fiber_intake, 1 if self.antibiotic else 0)
+        self._steady = self.fiber_intake <= 0 and not self.antibiotic
+        self._version += 1
 
     def gas_production(self) -> float:
+        if self._version == self._cached_v:
+            return self._cached_gas
         # rough heuristic: more bad bacteria and fiber -> more gas
-        return round(self.bad_bacteria * 0.08 + self.fiber_intake * 0.05, 2)
+        self._cached_gas = round(self.bad_bacteria * 0.08 + self.fiber_intake * 0.05, 2)
+        self._cached_v = self._version
+        return self._cached_gas
 
 
-@dataclass
+def _nutrient(index: int) -> property:
+    def getter(self) -> float:
+        return float(self.nutrients[index])
+    return property(getter)
+
+
+@dataclass(frozen=True, slots=True)
 class Food:
+    # Immutable value object: a name plus one read-only float64 vector
+    # [carbs, proteins, fats, fiber]. Build it from the four amounts or pass
+    # `nutrients` directly; organs derive changed meals with
+    # dataclasses.replace(food, nutrients=...).
     name: str
-    carbs: float
-    proteins: float
-    fats: float
-    fiber: float = 0.0
+    carbs: InitVar[float] = 0.0
+    proteins: InitVar[float] = 0.0
+    fats: InitVar[float] = 0.0
+    fiber: InitVar[float] = 0.0
+    nutrients: Optional[np.ndarray] = None
+
+    def __post_init__(self, carbs: float, proteins: float, fats: float, fiber: float) -> None:
+        nutrients = (carbs, proteins, fats, fiber) if self.nutrients is None else self.nutrients
+        # asarray takes over a float64 vector as is, so replace() costs no second copy
+        nutrients = np.asarray(nutrients, dtype=np.float64)
+        nutrients.flags.writeable = False
+        object.__setattr__(self, 'nutrients', nutrients)
+
+    def __eq__(self, other) -> bool:
+        if not isinstance(other, Food):
+            return NotImplemented
+        return self.name == other.name and np.array_equal(self.nutrients, other.nutrients)
+
+    def __hash__(self) -> int:
+        return hash((self.name, self.nutrients.tobytes()))
+
+    def __repr__(self) -> str:
+        return (f"Food(name={self.name!r}, carbs={self.carbs}, proteins={self.proteins}, "
+                f"fats={self.fats}, fiber={self.fiber})")
+
+
+# read accessors; set after the class body because the InitVar defaults use the same names
+Food.carbs = _nutrient(CARBS)
+Food.proteins = _nutrient(PROTEINS)
+Food.fats = _nutrient(FATS)
+Food.fiber = _nutrient(FIBER)
 
 
 @dataclass
@@ -76,32 +272,95 @@ class Environment:
     stress_level: int = 2  # 0-10
 
 
-@dataclass
+# Conditions.flags bits, in Conditions.NAMES order
+FLAG_GASTROPARESIS, FLAG_GERD, FLAG_MALABSORPTION, FLAG_DIABETES, FLAG_OBESITY = (1 << i for i in range(5))
+
+
+def _condition(flag: int) -> property:
+    def getter(self) -> bool:
+        return bool(self._flags & flag)
+
+    def setter(self, value: bool) -> None:
+        self.set(flag, value)
+    return property(getter, setter)
+
+
 class Conditions:
-    gastroparesis: bool = False
-    gerd: bool = False
-    malabsorption: bool = False
-    diabetes: bool = False
-    obesity: bool = False
+    # Health conditions packed into one int bitmask. The display string is
+    # rebuilt only after the mask changes, not on every frame.
+    NAMES = ('gastroparesis', 'gerd', 'malabsorption', 'diabetes', 'obesity')
+
+    def __init__(self, gastroparesis: bool = False, gerd: bool = False, malabsorption: bool = False,
+                 diabetes: bool = False, obesity: bool = False, *, flags: int = 0):
+        # same arguments as the former dataclass, or a ready-made FLAG_* mask via flags=
+        for i, on in enumerate((gastroparesis, gerd, malabsorption, diabetes, obesity)):
+            if on:
+                flags |= 1 << i
+        self._flags = flags
+        self._active_str: Optional[str] = None
+
+    def __repr__(self) -> str:
+        return f"Conditions({', '.join(f'{name}=True' for name in self.active())})"
+
+    def __eq__(self, other) -> bool:
+        if not isinstance(other, Conditions):
+            return NotImplemented
+        return self._flags == other._flags
+
+    __hash__ = None  # mutable, like the dataclass it replaces
+
+    gastroparesis = _condition(FLAG_GASTROPARESIS)
+    gerd = _condition(FLAG_GERD)
+    malabsorption = _condition(FLAG_MALABSORPTION)
+    diabetes = _condition(FLAG_DIABETES)
+    obesity = _condition(FLAG_OBESITY)
+
+    @property
+    def flags(self) -> int:
+        return self._flags
+
+    def set(self, flag: int, on: bool) -> None:
+        flags = self._flags | flag if on else self._flags & ~flag
+        if flags != self._flags:
+            self._flags = flags
+            self._active_str = None
+
+    def toggle(self, flag: int) -> None:
+        self._flags ^= flag
+        self._active_str = None
 
     def active(self) -> List[str]:
-        return [k for k, v in self.__dict__.items() if v]
+        return [name for i, name in enumerate(self.NAMES) if self._flags & (1 << i)]
+
+    @property
+    def active_str(self) -> str:
+        # comma-separated active condition names, or 'none'
+        if self._active_str is None:
+            self._active_str = ', '.join(self.active()) or 'none'
+        return self._active_str
 
 
 # ---- Organs (single responsibility) ----
+# Saliva factor by [stressed][parasympathetic level]: high tone boosts it when calm,
+# low tone or stress reduces it
+_SALIVA_FACTOR = (
+    tuple({H.HIGH: 1.15, H.LOW: 0.75}.get(level, 1.0) for level in H),
+    tuple(0.75 for _ in H),
+)
+_AMYLASE_BREAKDOWN = 0.05  # share of carbs broken down per unit of saliva factor
+_PROTEIN_HYDROLYSIS = 0.5  # protein left after the stomach, before the gastrin factor
+_MALABSORPTION_FACTOR = 0.65
+
+
 class Mouth:
-    def process(self, food: Food, hormones: Dict[str, str], env: Environment) -> Dict:
-        parasym = hormones.get('parasympathetic_stim', 'Normal')
-        stress = env.stress_level
-        saliva_factor = 1.0
-        if parasym == 'High' and stress < 6:
-            saliva_factor = 1.15
-        elif parasym == 'Low' or stress >= 6:
-            saliva_factor = 0.75
+    def process(self, food: Food, hormones: Hormones, env: Environment) -> Dict:
+        # returns the partially digested food under 'food'; the input is never mutated
+        saliva_factor = _SALIVA_FACTOR[env.stress_level >= 6][hormones.parasympathetic_stim]
         # apply a light initial carb breakdown
-        # be careful not to mutate user-provided Food unexpectedly outside scope
-        food.carbs = max(0.0, food.carbs * (1.0 - 0.05 * saliva_factor))
-        return {'desc': 'Chewing and salivary amylase', 'saliva_factor': saliva_factor}
+        nutrients = food.nutrients.copy()
+        nutrients[CARBS] = nutrients[CARBS] * (1.0 - _AMYLASE_BREAKDOWN * saliva_factor)
+        return {'desc': 'Chewing and salivary amylase', 'saliva_factor': saliva_factor,
+                'food': replace(food, nutrients=nutrients)}
 
 
 class Esophagus:
@@ -109,6 +368,38 @@ class Esophagus:
         return {'desc': 'Peristalsis moves bolus to stomach'}
 
 
+# Stomach timer, specialized ahead of time over every discrete input combination
+# so start_digestion does one table lookup instead of a branch chain.
+_GASTRIN_FACTOR = tuple({H.HIGH: 1.3, H.LOW: 0.75}.get(level, 1.0) for level in H)
+
+
+def _stomach_timer(gastrin: int, ghrelin_high: bool, stressed: bool, temp_bucket: int,
+                   gastroparesis: bool, gerd: bool) -> int:
+    gastrin_factor = _GASTRIN_FACTOR[gastrin]
+    stress_factor = 0.85 if stressed else 1.0
+    # temp_bucket: 0 normal, 1 below 36C, 2 above 38C
+    temp_factor = (1.0, 0.9, 1.05)[temp_bucket]
+    disease_factor = 1.0
+    if gastroparesis:
+        disease_factor *= 1.8
+    if gerd:
+        disease_factor *= 1.05
+    hunger_factor = 0.9 if ghrelin_high else 1.0
+    base_timer = TIME_MAP['Stomach']
+    return max(2, int(base_timer / (gastrin_factor * temp_factor * hunger_factor) * disease_factor / stress_factor))
+
+
+def _timer_key(gastrin: int, ghrelin_high: bool, stressed: bool, temp_bucket: int,
+               gastroparesis: bool, gerd: bool) -> int:
+    return (gastrin << 6) | (ghrelin_high << 5) | (stressed << 4) | (temp_bucket << 2) | (gastroparesis << 1) | gerd
+
+
+_TIMER_LUT: Dict[int, int] = {
+    _timer_key(*combo): _stomach_timer(*combo)
+    for combo in itertools.product(range(len(H)), (False, True), (False, True), range(3), (False, True), (False, True))
+}
+
+
 class Stomach:
     def __init__(self):
         self.base_timer = TIME_MAP['Stomach']
@@ -116,32 +407,15 @@ class Stomach:
         self.food: Optional[Food] = None
         self.gastrin_factor = 1.0
 
-    def start_digestion(self, food: Food, hormones: Dict[str, str], cond: Conditions, env: Environment) -> Dict:
-        gastrin = hormones.get('gastrin', 'Normal')
-        ghrelin = hormones.get('ghrelin', 'Normal')
-        gastrin_factor = 1.0
-        if gastrin == 'High':
-            gastrin_factor = 1.3
-        elif gastrin == 'Low':
-            gastrin_factor = 0.75
-        stress_factor = 1.0 if env.stress_level < 6 else 0.85
+    def start_digestion(self, food: Food, hormones: Hormones, cond: Conditions, env: Environment) -> Dict:
+        gastrin = hormones.gastrin
         temp = env.temperature_c
-        temp_factor = 1.0
-        if temp < 36.0:
-            temp_factor = 0.9
-        elif temp > 38.0:
-            temp_factor = 1.05
-        disease_factor = 1.0
-        if cond.gastroparesis:
-            disease_factor *= 1.8
-        if cond.gerd:
-            disease_factor *= 1.05
-        hunger_factor = 0.9 if ghrelin == 'High' else 1.0
-        computed = max(2, int(self.base_timer / (gastrin_factor * temp_factor * hunger_factor) * disease_factor / stress_factor))
-        self.timer = computed
-        # store a shallow copy of food object to avoid accidental external mutation
-        self.food = Food(name=food.name, carbs=food.carbs, proteins=food.proteins, fats=food.fats, fiber=food.fiber)
-        self.gastrin_factor = gastrin_factor
+        temp_bucket = 1 if temp < 36.0 else 2 if temp > 38.0 else 0
+        key = _timer_key(gastrin, hormones.ghrelin == H.HIGH, env.stress_level >= 6, temp_bucket,
+                         cond.gastroparesis, cond.gerd)
+        self.timer = _TIMER_LUT[key]
+        self.food = food
+        self.gastrin_factor = _GASTRIN_FACTOR[gastrin]
         return {'desc': 'Stomach acid and pepsin', 'timer': self.timer}
 
     def digest_tick(self) -> Dict:
@@ -152,8 +426,9 @@ class Stomach:
         finished = None
         if self.food:
             # apply final protein hydrolysis depending on gastrin_factor
-            self.food.proteins = max(0.0, self.food.proteins * 0.5 * self.gastrin_factor)
-            finished = self.food
+            nutrients = self.food.nutrients.copy()
+            nutrients[PROTEINS] = nutrients[PROTEINS] * _PROTEIN_HYDROLYSIS * self.gastrin_factor
+            finished = replace(self.food, nutrients=nutrients)
         self.food = None
         return {'running': False, 'finished_food': finished}
 
@@ -162,7 +437,7 @@ class Duodenum:
     def __init__(self):
         self.timer = TIME_MAP['Duodenum']
 
-    def process_tick(self, hormones: Dict[str, str]) -> Dict:
+    def process_tick(self, hormones: Hormones) -> Dict:
         if self.timer > 0:
             self.timer -= 1
             return {'running': True, 'remaining_ticks': self.timer}
@@ -175,24 +450,20 @@ class SmallIntestine:
         self.timer = self.base_timer
         self.food: Optional[Food] = None
 
-    def start_absorption(self, food: Food, hormones: Dict[str, str]) -> Dict:
-        # create a copy of the food to simulate chyme entering the small intestine
-        self.food = Food(name=food.name, carbs=food.carbs, proteins=food.proteins, fats=food.fats, fiber=food.fiber)
+    def start_absorption(self, food: Food, hormones: Hormones) -> Dict:
+        # chyme entering the small intestine
+        self.food = food
         return {'desc': 'Brush border enzymes active', 'timer': self.timer}
 
-    def absorb_tick(self, cond: Conditions, env: Environment, hormones: Dict[str, str]) -> Dict:
+    def absorb_tick(self, cond: Conditions, env: Environment, hormones: Hormones) -> Dict:
         if self.timer > 0:
             self.timer -= 1
             return {'running': True, 'remaining_ticks': self.timer}
-        malabs_factor = 0.65 if cond.malabsorption else 1.0
+        malabs_factor = _MALABSORPTION_FACTOR if cond.malabsorption else 1.0
         insulin_resistance = 0.75 if (cond.diabetes or cond.obesity) else 1.0
-        absorbed = {
-            'carbs': max(0.0, self.food.carbs * 0.95 * malabs_factor),
-            'proteins': max(0.0, self.food.proteins * 0.9 * malabs_factor),
-            'fats': max(0.0, self.food.fats * 0.85 * malabs_factor)
-        }
-        energy_kcal = (absorbed['carbs'] * 4 + absorbed['proteins'] * 4 + absorbed['fats'] * 9) * insulin_resistance
-        return {'running': False, 'absorbed': absorbed, 'energy_kcal': energy_kcal}
+        grams, energy_kcal = _absorb(self.food.nutrients, malabs_factor, insulin_resistance)
+        absorbed = {'carbs': float(grams[CARBS]), 'proteins': float(grams[PROTEINS]), 'fats': float(grams[FATS])}
+        return {'running': False, 'absorbed': absorbed, 'energy_kcal': float(energy_kcal)}
 
 
 class LargeIntestine:
@@ -212,18 +483,35 @@ class Rectum:
 
 
 # ---- Body & metabolism ----
+# Hormone levels set on entering a stage, as (Hormones field, level if calm, level if stressed);
+# shared with BodyBatch. Insulin also depends on per-body state and is handled in code.
+_STAGE_ENTRY_HORMONES: Dict[str, Tuple[Tuple[str, H, H], ...]] = {
+    # chewing increases parasympathetic tone slightly
+    'mouth': (('parasympathetic_stim', H.HIGH, H.NORMAL),),
+    'esophagus': (('parasympathetic_stim', H.NORMAL, H.NORMAL),),
+    # gastrin promotes acid secretion, ghrelin falls when food arrives and
+    # parasympathetic tone supports digestion unless stressed
+    'stomach': (('gastrin', H.HIGH, H.HIGH), ('ghrelin', H.LOW, H.LOW), ('parasympathetic_stim', H.HIGH, H.LOW)),
+    # cholecystokinin (not tracked) would rise
+    'duodenum': (('gastrin', H.NORMAL, H.NORMAL),),
+    # modest reduction in parasympathetic tone under severe stress
+    'small_intestine': (('parasympathetic_stim', H.HIGH, H.NORMAL),),
+    # decreased hormonal activity
+    'large_intestine': (('insulin', H.NORMAL, H.NORMAL), ('gastrin', H.LOW, H.LOW)),
+    'rectum': (('parasympathetic_stim', H.NORMAL, H.NORMAL),),
+}
+
+
 class Body:
     def __init__(self, env: Environment, cond: Conditions):
         self.env = env
         self.cond = cond
         self.microbiome = Microbiome()
-        self.hormones: Dict[str, str] = {
-            'parasympathetic_stim': 'Normal',
-            'gastrin': 'Normal',
-            'ghrelin': 'Normal',
-            'insulin': 'Normal',
-            'leptin': 'Normal'
-        }
+        self.hormones = Hormones()
+        # bumped whenever a hormone level actually changes; every write compares first
+        self.hormones_version = 0
+        self._hormones_view: Tuple[Tuple[str, str], ...] = ()
+        self._hormones_view_version = -1
         self.hunger_level = 5
         self.energy = 0.0
         self.stage = 'idle'
@@ -231,6 +519,7 @@ class Body:
         self.ticks = 0  # ticks in current stage
         self.total_ticks = 0
         self.food: Optional[Food] = None
+        self._food_dirty = True  # food changed since the microbiome was last fed
         self.current_absorbed: Dict[str, float] = {}
         self.metabolism: Optional[Dict[str, float]] = None
 
@@ -243,34 +532,54 @@ class Body:
         self.large_intestine = LargeIntestine()
         self.rectum = Rectum()
 
+    def hormones_view(self) -> Tuple[Tuple[str, str], ...]:
+        # (name, level) pairs for the renderer, rebuilt only after a hormone changed
+        if self._hormones_view_version != self.hormones_version:
+            self._hormones_view = self.hormones.str_view()
+            self._hormones_view_version = self.hormones_version
+        return self._hormones_view
+
     def set_hunger_from_flags(self) -> None:
         # leptin and ghrelin reflect adiposity and short-term hunger
+        h = self.hormones
         if self.cond.obesity:
-            self.hormones['leptin'] = 'High'
+            if h.leptin != H.HIGH:
+                h.leptin = H.HIGH
+                self.hormones_version += 1
             # obesity leads to reduced subjective hunger
             self.hunger_level = max(1, self.hunger_level - 2)
-            self.hormones['ghrelin'] = 'Low'
+            ghrelin = H.LOW
         else:
-            if self.hunger_level >= 7:
-                self.hormones['ghrelin'] = 'High'
-            else:
-                self.hormones['ghrelin'] = 'Low'
+            ghrelin = H.HIGH if self.hunger_level >= 7 else H.LOW
+        if h.ghrelin != ghrelin:
+            h.ghrelin = ghrelin
+            self.hormones_version += 1
 
     def eat(self, food: Food) -> None:
-        self.food = Food(name=food.name, carbs=food.carbs, proteins=food.proteins, fats=food.fats, fiber=food.fiber)
+        self.food = food
+        self._food_dirty = True
         self.stage = 'mouth'
+        h = self.hormones
         # satiety signal after initiating a meal
-        self.hormones['ghrelin'] = 'Low'
+        if h.ghrelin != H.LOW:
+            h.ghrelin = H.LOW
+            self.hormones_version += 1
         self.hunger_level = max(0, self.hunger_level - 3)
         # small anticipatory insulin rise when food is taken
-        self.hormones['insulin'] = 'Slight'
+        if h.insulin != H.SLIGHT:
+            h.insulin = H.SLIGHT
+            self.hormones_version += 1
+
+    def skip_current_stage(self) -> None:
+        # zero every organ timer so the current stage (and later ones) finish on their next tick
+        self.stomach.timer = 0
+        self.duodenum.timer = 0
+        self.small_intestine.timer = 0
+        self.large_intestine.timer = 0
 
     def metabolize(self, absorbed: Dict[str, float]) -> Dict[str, float]:
-        # simple partition: carbs -> glycogen, fats -> stored fat, proteins -> used
-        glycogen = min(100.0, absorbed.get('carbs', 0.0) * 0.6)
-        fat_storage = absorbed.get('fats', 0.0) * 0.7
-        protein_use = absorbed.get('proteins', 0.0) * 0.8
-        energy_added = glycogen * 4 + protein_use * 4 + fat_storage * 9
+        glycogen, fat_storage, protein_use, energy_added = _metabolize(
+            absorbed.get('carbs', 0.0), absorbed.get('proteins', 0.0), absorbed.get('fats', 0.0))
         self.energy += energy_added
         result = {
             'glycogen': round(glycogen, 2),
@@ -283,121 +592,127 @@ class Body:
 
     def _update_hormones_on_stage_entry(self):
         # Called when stage changes; set hormones that should change when a stage begins
+        h = self.hormones
+        calm = self.env.stress_level < 6
+        for name, if_calm, if_stressed in _STAGE_ENTRY_HORMONES.get(self.stage, ()):
+            level = if_calm if calm else if_stressed
+            if getattr(h, name) != level:
+                setattr(h, name, level)
+                self.hormones_version += 1
         if self.stage == 'mouth':
-            # chewing increases parasympathetic tone slightly
-            self.hormones['parasympathetic_stim'] = 'High' if self.env.stress_level < 6 else 'Normal'
-            # anticipatory insulin
-            if self.hormones.get('insulin') != 'High':
-                self.hormones['insulin'] = 'Slight'
-        elif self.stage == 'esophagus':
-            # neutral
-            self.hormones['parasympathetic_stim'] = 'Normal'
-        elif self.stage == 'stomach':
-            # increase gastrin to promote acid secretion
-            self.hormones['gastrin'] = 'High'
-            # ghrelin falls when food arrives
-            self.hormones['ghrelin'] = 'Low'
-            # parasympathetic tone supports digestion unless stressed
-            self.hormones['parasympathetic_stim'] = 'High' if self.env.stress_level < 6 else 'Low'
-        elif self.stage == 'duodenum':
-            # cholecystokinin (not tracked) would rise; we simulate insulin rise input
-            self.hormones['gastrin'] = 'Normal'
+            # anticipatory insulin, unless it is already high
+            if h.insulin != H.HIGH and h.insulin != H.SLIGHT:
+                h.insulin = H.SLIGHT
+                self.hormones_version += 1
         elif self.stage == 'small_intestine':
             # major nutrient absorption: insulin should rise
-            self.hormones['insulin'] = 'High' if not self.cond.diabetes else 'Impaired'
-            # modest reduction in parasympathetic if severe stress
-            self.hormones['parasympathetic_stim'] = 'Normal' if self.env.stress_level >= 6 else 'High'
-        elif self.stage == 'large_intestine':
-            # decreased hormonal activity
-            self.hormones['insulin'] = 'Normal'
-            self.hormones['gastrin'] = 'Low'
-        elif self.stage == 'rectum':
-            # finalize
-            self.hormones['parasympathetic_stim'] = 'Normal'
+            insulin = H.HIGH if not self.cond.diabetes else H.IMPAIRED
+            if h.insulin != insulin:
+                h.insulin = insulin
+                self.hormones_version += 1
 
     def tick(self) -> Dict:
+        # hot attributes bound to locals; stage and food are written back below
+        stage, food, env, hormones, cond = self.stage, self.food, self.env, self.hormones, self.cond
+
         # update autonomic tone from stress each tick
         # this is overwritten by stage-specific settings below when entering a stage
-        self.hormones['parasympathetic_stim'] = 'Low' if self.env.stress_level >= 6 else 'Normal'
+        parasym = H.LOW if env.stress_level >= 6 else H.NORMAL
+        if hormones.parasympathetic_stim != parasym:
+            hormones.parasympathetic_stim = parasym
+            self.hormones_version += 1
 
         # track stage transitions
-        if self.prev_stage != self.stage:
+        if self.prev_stage != stage:
             # reset per-stage tick counter and let organs know
             self.ticks = 0
             self._update_hormones_on_stage_entry()
-            self.prev_stage = self.stage
+            self.prev_stage = stage
 
         info: Dict = {}
-        if self.stage == 'idle':
+        if stage == 'idle':
             self.set_hunger_from_flags()
             info['status'] = 'Idle'
 
-        elif self.stage == 'mouth':
-            info = self.mouth.process(self.food, self.hormones, self.env)
+        elif stage == 'mouth':
+            info = self.mouth.process(food, hormones, env)
+            food = info['food']
+            self._food_dirty = True
             # after mouth processing, move to esophagus next tick
-            self.stage = 'esophagus'
+            stage = 'esophagus'
 
-        elif self.stage == 'esophagus':
-            info = self.esophagus.transport(self.env)
-            self.stage = 'stomach'
+        elif stage == 'esophagus':
+            info = self.esophagus.transport(env)
+            stage = 'stomach'
 
-        elif self.stage == 'stomach':
-            if self.stomach.food is None:
-                info = self.stomach.start_digestion(self.food, self.hormones, self.cond, self.env)
+        elif stage == 'stomach':
+            stomach = self.stomach
+            if stomach.food is None:
+                info = stomach.start_digestion(food, hormones, cond, env)
             else:
-                info = self.stomach.digest_tick()
+                info = stomach.digest_tick()
                 if not info.get('running'):
-                    self.food = info.get('finished_food')
+                    food = info.get('finished_food')
                     # if stomach finished and provided finished_food is None, create placeholder
-                    if self.food is None:
+                    if food is None:
                         # ensure safe downstream
-                        self.food = Food(name='chyme', carbs=0.0, proteins=0.0, fats=0.0, fiber=0.0)
-                    self.stage = 'duodenum'
+                        food = Food(name='chyme')
+                    self._food_dirty = True
+                    stage = 'duodenum'
 
-        elif self.stage == 'duodenum':
-            res = self.duodenum.process_tick(self.hormones)
+        elif stage == 'duodenum':
+            res = self.duodenum.process_tick(hormones)
             if not res.get('running'):
-                self.stage = 'small_intestine'
-                info = self.small_intestine.start_absorption(self.food, self.hormones)
+                stage = 'small_intestine'
+                info = self.small_intestine.start_absorption(food, hormones)
             else:
                 info = res
 
-        elif self.stage == 'small_intestine':
-            res = self.small_intestine.absorb_tick(self.cond, self.env, self.hormones)
+        elif stage == 'small_intestine':
+            res = self.small_intestine.absorb_tick(cond, env, hormones)
             if not res.get('running'):
                 self.current_absorbed = res['absorbed']
                 # metabolize and record
                 self.metabolism = self.metabolize(self.current_absorbed)
-                self.stage = 'large_intestine'
+                stage = 'large_intestine'
                 info = {'status': 'Absorption complete', 'absorbed': self.current_absorbed}
             else:
                 info = res
 
-        elif self.stage == 'large_intestine':
+        elif stage == 'large_intestine':
             res = self.large_intestine.tick()
             if not res.get('running'):
-                self.stage = 'rectum'
+                stage = 'rectum'
             info = res
 
-        elif self.stage == 'rectum':
+        elif stage == 'rectum':
             _ = self.rectum.store_and_defecate()
             # finalize digestion and reset
-            self.stage = 'idle'
+            stage = 'idle'
             # reset organs for next meal
             self.stomach = Stomach()
             self.duodenum = Duodenum()
             self.small_intestine = SmallIntestine()
             self.large_intestine = LargeIntestine()
-            self.food = None
+            food = None
+            self._food_dirty = True
             self.hunger_level = min(10, self.hunger_level + 4)
             info = {'status': 'Defecation complete'}
 
         else:
             info = {'status': 'Unknown'}
 
-        # feed microbiome with fiber from current food
-        self.microbiome.fiber_intake = self.food.fiber if self.food else 0.0
-        self.microbiome.tick()
+        self.stage = stage
+        self.food = food
+
+        # feed microbiome with fiber from current food, only when the food changed;
+        # skip its tick entirely once it has settled (no fiber, no antibiotic)
+        microbiome = self.microbiome
+        if self._food_dirty:
+            microbiome.feed(food.fiber if food else 0.0)
+            self._food_dirty = False
+        if microbiome.needs_tick:
+            microbiome.tick()
 
         # tick counters
         self.ticks += 1
@@ -405,110 +720,555 @@ class Body:
         return info
 
 
+# ---- Batched headless simulation ----
+# Stage codes used by BodyBatch (index into STAGES for the Body stage names)
+STAGES = ('idle', 'mouth', 'esophagus', 'stomach', 'duodenum', 'small_intestine', 'large_intestine', 'rectum')
+S_IDLE, S_MOUTH, S_ESOPHAGUS, S_STOMACH, S_DUODENUM, S_SMALL_INTESTINE, S_LARGE_INTESTINE, S_RECTUM = range(len(STAGES))
+
+# BodyBatch.timers columns
+STOMACH, DUODENUM, SMALL_INTESTINE, LARGE_INTESTINE = range(4)
+
+_BASE_TIMERS = np.array([TIME_MAP['Stomach'], TIME_MAP['Duodenum'], TIME_MAP['SmallIntestine'],
+                         TIME_MAP['LargeIntestine']], dtype=np.int32)
+_TIMER_LUT_ARRAY = np.array([_TIMER_LUT.get(key, 0) for key in range(max(_TIMER_LUT) + 1)], dtype=np.int32)
+_GASTRIN_FACTOR_ARRAY = np.array(_GASTRIN_FACTOR)
+_SALIVA_FACTOR_ARRAY = np.array(_SALIVA_FACTOR)
+_STAGE_ENTRY_CODES = tuple(
+    (STAGES.index(stage), tuple((HORMONE_NAMES.index(name), if_calm, if_stressed) for name, if_calm, if_stressed in entries))
+    for stage, entries in _STAGE_ENTRY_HORMONES.items())
+
+
+class BodyBatch:
+    # N independent bodies advanced together: the same state machine as Body.tick,
+    # but every per-body field is an (N,) or (N, k) array and each stage is applied
+    # to all bodies in it at once with masked NumPy ops. Environment and conditions
+    # are shared by the whole batch; antibiotic exposure is per body.
+    def __init__(self, n: int, env: Environment, cond: Conditions):
+        self.n = n
+        self.env = env
+        self.cond = cond
+        self.good = np.full(n, 70.0)
+        self.bad = np.full(n, 30.0)
+        self.antibiotic = np.zeros(n, dtype=bool)
+        self.hormones = np.full((n, len(HORMONE_NAMES)), H.NORMAL, dtype=np.int8)
+        self.hunger = np.full(n, 5, dtype=np.int32)
+        self.energy = np.zeros(n)
+        self.stage = np.full(n, S_IDLE, dtype=np.int8)
+        self.prev_stage = np.full(n, -1, dtype=np.int8)
+        self.ticks = np.zeros(n, dtype=np.int32)
+        self.total_ticks = 0
+        self.timers = np.tile(_BASE_TIMERS, (n, 1))
+        self.nutrients = np.zeros((n, 4))
+        self.has_food = np.zeros(n, dtype=bool)
+        # stomach.food is not None / stomach.gastrin_factor in Body terms
+        self.digesting = np.zeros(n, dtype=bool)
+        self.gastrin_factor = np.ones(n)
+
+    def eat(self, foods) -> None:
+        # `foods` is one Food for every body or a sequence of N Food
+        if isinstance(foods, Food):
+            self.nutrients[:] = foods.nutrients
+        else:
+            self.nutrients[:] = np.stack([food.nutrients for food in foods])
+        self.has_food[:] = True
+        self.stage[:] = S_MOUTH
+        # satiety signal after initiating a meal
+        self.hormones[:, GHRELIN] = H.LOW
+        self.hunger = np.maximum(0, self.hunger - 3)
+        # small anticipatory insulin rise when food is taken
+        self.hormones[:, INSULIN] = H.SLIGHT
+
+    def skip_current_stage(self) -> None:
+        self.timers[:] = 0
+
+    @property
+    def done(self) -> bool:
+        return bool(np.all((self.stage == S_IDLE) & ~self.has_food))
+
+    def _enter_stages(self) -> None:
+        # vectorized Body._update_hormones_on_stage_entry
+        h = self.hormones
+        calm = self.env.stress_level < 6
+        entered = self.stage != self.prev_stage
+        self.ticks[entered] = 0
+        for code, entries in _STAGE_ENTRY_CODES:
+            at = entered & (self.stage == code)
+            for index, if_calm, if_stressed in entries:
+                h[at, index] = if_calm if calm else if_stressed
+        h[entered & (self.stage == S_MOUTH) & (h[:, INSULIN] != H.HIGH), INSULIN] = H.SLIGHT
+        h[entered & (self.stage == S_SMALL_INTESTINE), INSULIN] = H.IMPAIRED if self.cond.diabetes else H.HIGH
+        self.prev_stage[:] = self.stage
+
+    def _count_down(self, in_stage: np.ndarray, slot: int) -> np.ndarray:
+        # decrement running timers; returns the bodies whose timer had already run out
+        running = in_stage & (self.timers[:, slot] > 0)
+        self.timers[running, slot] -= 1
+        return in_stage & ~running
+
+    def tick(self) -> None:
+        env, cond, h = self.env, self.cond, self.hormones
+        stressed = env.stress_level >= 6
+        # update autonomic tone from stress each tick
+        h[:, PARASYM] = H.LOW if stressed else H.NORMAL
+        self._enter_stages()
+
+        stage = self.stage.copy()  # dispatch on the stage each body was in at tick start
+
+        idle = stage == S_IDLE
+        if idle.any():
+            if cond.obesity:
+                h[idle, LEPTIN] = H.HIGH
+                self.hunger[idle] = np.maximum(1, self.hunger[idle] - 2)
+                h[idle, GHRELIN] = H.LOW
+            else:
+                h[idle, GHRELIN] = np.where(self.hunger[idle] >= 7, H.HIGH, H.LOW)
+
+        mouth = stage == S_MOUTH
+        if mouth.any():
+            saliva = _SALIVA_FACTOR_ARRAY[int(stressed), h[mouth, PARASYM]]
+            breakdown = 1.0 - _AMYLASE_BREAKDOWN * saliva
+            self.nutrients[mouth, CARBS] *= breakdown
+            self.stage[mouth] = S_ESOPHAGUS
+
+        self.stage[stage == S_ESOPHAGUS] = S_STOMACH
+
+        stomach = stage == S_STOMACH
+        if stomach.any():
+            start = stomach & ~self.digesting
+            if start.any():
+                temp = env.temperature_c
+                temp_bucket = 1 if temp < 36.0 else 2 if temp > 38.0 else 0
+                gastrin = h[start, GASTRIN].astype(np.int64)
+                keys = _timer_key(gastrin, h[start, GHRELIN] == H.HIGH, stressed, temp_bucket,
+                                  cond.gastroparesis, cond.gerd)
+                self.timers[start, STOMACH] = _TIMER_LUT_ARRAY[keys]
+                self.gastrin_factor[start] = _GASTRIN_FACTOR_ARRAY[gastrin]
+                self.digesting[start] = True
+            finished = self._count_down(stomach & ~start, STOMACH)
+            if finished.any():
+                # final protein hydrolysis depending on gastrin_factor
+                self.nutrients[finished, PROTEINS] = (
+                    self.nutrients[finished, PROTEINS] * _PROTEIN_HYDROLYSIS * self.gastrin_factor[finished])
+                self.digesting[finished] = False
+                self.stage[finished] = S_DUODENUM
+
+        finished = self._count_down(stage == S_DUODENUM, DUODENUM)
+        self.stage[finished] = S_SMALL_INTESTINE
+
+        finished = self._count_down(stage == S_SMALL_INTESTINE, SMALL_INTESTINE)
+        if finished.any():
+            malabs_factor = _MALABSORPTION_FACTOR if cond.malabsorption else 1.0
+            absorbed = self.nutrients[finished, :3] * _ABSORPTION_RATES * malabs_factor
+            # vectorized _metabolize
+            glycogen = np.minimum(_GLYCOGEN_CAP, absorbed[:, CARBS] * _GLYCOGEN_SHARE)
+            fat_storage = absorbed[:, FATS] * _FAT_STORE_SHARE
+            protein_use = absorbed[:, PROTEINS] * _PROTEIN_USE_SHARE
+            self.energy[finished] += glycogen * _KCAL_CARBS + protein_use * _KCAL_PROTEIN + fat_storage * _KCAL_FAT
+            self.stage[finished] = S_LARGE_INTESTINE
+
+        finished = self._count_down(stage == S_LARGE_INTESTINE, LARGE_INTESTINE)
+        self.stage[finished] = S_RECTUM
+
+        rectum = stage == S_RECTUM
+        if rectum.any():
+            # finalize digestion and reset organs for next meal
+            self.stage[rectum] = S_IDLE
+            self.timers[rectum] = _BASE_TIMERS
+            self.digesting[rectum] = False
+            self.has_food[rectum] = False
+            self.hunger[rectum] = np.minimum(10, self.hunger[rectum] + 4)
+
+        # microbiome: vectorized _micro_tick over every body
+        fiber = np.where(self.has_food, self.nutrients[:, FIBER], 0.0)
+        fed = fiber > 0
+        self.good[fed] = np.minimum(100.0, self.good[fed] + _FIBER_GOOD_GAIN)
+        self.bad[fed] = np.maximum(0.0, self.bad[fed] - _FIBER_BAD_LOSS)
+        dosed = self.antibiotic
+        self.good[dosed] = np.maximum(0.0, self.good[dosed] - _ANTIBIOTIC_GOOD_LOSS)
+        self.bad[dosed] = np.maximum(0.0, self.bad[dosed] - _ANTIBIOTIC_BAD_LOSS)
+        total = self.good + self.bad
+        alive = total > 0
+        self.good[alive] = (self.good[alive] / total[alive]) * 100
+        self.bad[alive] = (self.bad[alive] / total[alive]) * 100
+
+        # tick counters
+        self.ticks += 1
+        self.total_ticks += 1
+
+
+# ---- Simulation snapshot (handed from the simulation thread to the renderer) ----
+@dataclass(frozen=True)
+class SimState:
+    stage: str
+    ticks: int
+    total_ticks: int
+    temperature_c: float
+    stress_level: int
+    conditions: str
+    hormones: Tuple[Tuple[str, str], ...]
+    hormones_version: int
+    energy: float
+    good_bacteria: float
+    bad_bacteria: float
+    fiber_intake: float
+    gas: float
+    food: Optional[Food]
+    metabolism: Optional[Dict[str, float]]
+    progress_desc: str
+    progress_total: int
+    progress_completed: int
+    done: bool
+
+    @classmethod
+    def capture(cls, body: Body) -> 'SimState':
+        desc, remaining, total = organ_progress(body)
+        return cls(
+            stage=body.stage,
+            ticks=body.ticks,
+            total_ticks=body.total_ticks,
+            temperature_c=body.env.temperature_c,
+            stress_level=body.env.stress_level,
+            conditions=body.cond.active_str,
+            hormones=body.hormones_view(),
+            hormones_version=body.hormones_version,
+            energy=body.energy,
+            good_bacteria=body.microbiome.good_bacteria,
+            bad_bacteria=body.microbiome.bad_bacteria,
+            fiber_intake=body.microbiome.fiber_intake,
+            gas=body.microbiome.gas_production(),
+            food=body.food,  # immutable, safe to share across threads
+            metabolism=dict(body.metabolism) if body.metabolism else None,
+            progress_desc=desc,
+            progress_total=total,
+            progress_completed=max(0, total - remaining),
+            done=body.stage == 'idle' and body.food is None,
+        )
+
+
+def organ_progress(body: Body) -> Tuple[str, int, int]:
+    # (description, remaining ticks, total ticks) of the organ currently running a timer
+    if body.stage == 'stomach':
+        # If digestion hasn't started yet, compute will set timer on start_digestion
+        if body.stomach.timer > 0:
+            return 'Stomach', body.stomach.timer, body.stomach.base_timer
+    elif body.stage == 'duodenum':
+        return 'Duodenum', body.duodenum.timer, TIME_MAP['Duodenum']
+    elif body.stage == 'small_intestine':
+        return 'Small Intestine', body.small_intestine.timer, body.small_intestine.base_timer
+    elif body.stage == 'large_intestine':
+        return 'Large Intestine', body.large_intestine.timer, TIME_MAP['LargeIntestine']
+    return 'idle', 0, 1
+
+
 # ---- UI helpers ----
-def input_listener(command_queue: queue.Queue, stop_event: threading.Event) -> None:
+class CommandReader:
+    # Polled once per tick; returns whatever complete command lines are waiting
+    # on stdin without ever blocking. On POSIX it reads the raw fd with os.read:
+    # sys.stdin (and input()) read ahead into a buffer that select() cannot see.
+    def __init__(self):
+        self._chars: List[str] = []
+        self._buf = b''
+        self.closed = False
+
+    def _read_available(self, timeout: Optional[float]) -> None:
+        # POSIX only: append everything the fd has ready, waiting up to `timeout` for the first chunk
+        fd = sys.stdin.fileno()
+        while not self.closed and select.select([fd], [], [], timeout)[0]:
+            data = os.read(fd, 4096)
+            if not data:
+                # EOF: stdin stays "readable" forever, stop polling it
+                self.closed = True
+                break
+            self._buf += data
+            timeout = 0
+
+    def _take_line(self) -> Optional[str]:
+        if b'\n' in self._buf:
+            line, _, self._buf = self._buf.partition(b'\n')
+        elif self.closed and self._buf:
+            # unterminated last line before EOF
+            line, self._buf = self._buf, b''
+        else:
+            return None
+        return line.decode(errors='replace')
+
+    def poll(self) -> List[str]:
+        lines: List[str] = []
+        try:
+            if msvcrt is not None:
+                while msvcrt.kbhit():
+                    ch = msvcrt.getwche()
+                    if ch in '\r\n':
+                        lines.append(''.join(self._chars))
+                        self._chars.clear()
+                    elif ch == '\b':
+                        if self._chars:
+                            self._chars.pop()
+                    else:
+                        self._chars.append(ch)
+            else:
+                self._read_available(0)
+                while (line := self._take_line()) is not None:
+                    lines.append(line)
+        except (OSError, ValueError):
+            # ignore input errors; they should not crash the simulation
+            self.closed = True
+        return [cmd for cmd in (line.strip().lower() for line in lines) if cmd]
+
+    def readline(self, prompt: str = '') -> Optional[str]:
+        # Blocking line read for the meal menu; shares the buffer with poll() so
+        # commands typed ahead of time are not lost. Returns None at EOF.
+        try:
+            if msvcrt is not None:
+                return input(prompt)
+            sys.stdout.write(prompt)
+            sys.stdout.flush()
+            while (line := self._take_line()) is None:
+                if self.closed:
+                    return None
+                self._read_available(None)
+            return line
+        except (EOFError, OSError, ValueError):
+            self.closed = True
+            return None
+
+
+def apply_command(body: Body, cmd: str) -> None:
+    if cmd == 'n':
+        body.skip_current_stage()
+    elif cmd == '+':
+        body.env.stress_level = min(10, body.env.stress_level + 1)
+    elif cmd == '-':
+        body.env.stress_level = max(0, body.env.stress_level - 1)
+    elif cmd == 't':
+        body.env.temperature_c += 0.5
+    elif cmd == 'g':
+        body.env.temperature_c -= 0.5
+    elif cmd == 'o':
+        body.cond.toggle(FLAG_OBESITY)
+    elif cmd == 'm':
+        body.cond.toggle(FLAG_MALABSORPTION)
+    elif cmd == 'a':
+        body.microbiome.antibiotic = not body.microbiome.antibiotic
+
+
+# how often stdin is polled while waiting for the next tick
+_INPUT_POLL_S = 0.05
+
+
+def _put_state(state_q: queue.Queue, state: Optional[SimState], stop_event: threading.Event) -> bool:
+    # blocking put that gives up once the pipeline is shutting down
+    while True:
+        try:
+            state_q.put(state, timeout=0.1)
+            return True
+        except queue.Full:
+            if stop_event.is_set():
+                return False
+
+
+def _put_sentinel(state_q: queue.Queue) -> None:
+    # The end-of-stream None must always arrive or the renderer blocks on get()
+    # forever: if the queue is full, drop the oldest pending frame to make room
+    while True:
+        try:
+            state_q.put_nowait(None)
+            return
+        except queue.Full:
+            try:
+                state_q.get_nowait()
+            except queue.Empty:
+                pass
+
+
+def simulate(body: Body, state_q: queue.Queue, stop_event: threading.Event, tick_rate: float = 1.0,
+             commands: Optional[CommandReader] = None) -> None:
+    # Pipeline stage 1: owns `body` exclusively and publishes one snapshot per tick.
+    # tick_rate is in ticks per second; 0 means run as fast as possible.
+    period = 1.0 / tick_rate if tick_rate > 0 else 0.0
+    if commands is None:
+        commands = CommandReader()
+    paused = False
+    changed = True  # anything to show since the last published snapshot?
     try:
         while not stop_event.is_set():
-            cmd = input().strip().lower()
-            if cmd:
-                command_queue.put(cmd)
-            if cmd == 'q':
-                break
-    except Exception:
-        # ignore input errors; they should not crash the thread
-        pass
+            if not paused:
+                body.tick()
+                changed = True
+
+            # while paused, only publish a frame when a command changed something
+            if changed:
+                state = SimState.capture(body)
+                if not _put_state(state_q, state, stop_event) or state.done:
+                    break
+                changed = False
 
+            # wait for the next tick, handling commands as they arrive; 'q' and
+            # Ctrl-C in the renderer both set stop_event, which ends the wait at once
+            deadline = time.monotonic() + (max(period, _INPUT_POLL_S) if paused else period)
+            while True:
+                for cmd in commands.poll():
+                    changed = True
+                    if cmd == 'p':
+                        paused = not paused
+                    elif cmd == 'q':
+                        stop_event.set()
+                        break
+                    else:
+                        apply_command(body, cmd)
+                remaining = deadline - time.monotonic()
+                if remaining <= 0 or stop_event.wait(min(remaining, _INPUT_POLL_S)):
+                    break
+    finally:
+        # sentinel: tells the renderer there is nothing more to draw
+        _put_sentinel(state_q)
 
-def render_plain_status(body: Body, spinner: str) -> str:
+
+def render_plain_status(state: SimState, spinner: str) -> str:
     lines: List[str] = []
-    lines.append(f"Stage: {body.stage}")
-    lines.append(f"Ticks (stage): {body.ticks}")
-    lines.append(f"Ticks (total): {body.total_ticks}")
+    lines.append(f"Stage: {state.stage}")
+    lines.append(f"Ticks (stage): {state.ticks}")
+    lines.append(f"Ticks (total): {state.total_ticks}")
     lines.append(f"Spinner: {spinner}")
-    lines.append(f"Env: temp={body.env.temperature_c:.1f}C stress={body.env.stress_level}")
-    lines.append(f"Conditions: {', '.join(body.cond.active()) or 'none'}")
-    lines.append(f"Hormones: {body.hormones}")
-    lines.append(f"Energy so far: {round(body.energy,2)} kcal")
-    lines.append(f"Microbiome good/bad: {body.microbiome.good_bacteria:.1f}% / {body.microbiome.bad_bacteria:.1f}%")
-    lines.append(f"Fiber intake: {body.microbiome.fiber_intake:.1f} g")
-    lines.append(f"Gas production: {body.microbiome.gas_production()} units")
-    if body.food:
-        lines.append(f"Food: {body.food.name} carbs={body.food.carbs:.1f} proteins={body.food.proteins:.1f} fats={body.food.fats:.1f} fiber={body.food.fiber:.1f}")
-    if body.metabolism:
-        m = body.metabolism
+    lines.append(f"Env: temp={state.temperature_c:.1f}C stress={state.stress_level}")
+    lines.append(f"Conditions: {state.conditions}")
+    lines.append(f"Hormones: {dict(state.hormones)}")
+    lines.append(f"Energy so far: {round(state.energy,2)} kcal")
+    lines.append(f"Microbiome good/bad: {state.good_bacteria:.1f}% / {state.bad_bacteria:.1f}%")
+    lines.append(f"Fiber intake: {state.fiber_intake:.1f} g")
+    lines.append(f"Gas production: {state.gas} units")
+    if state.food:
+        lines.append(f"Food: {state.food.name} carbs={state.food.carbs:.1f} proteins={state.food.proteins:.1f} fats={state.food.fats:.1f} fiber={state.food.fiber:.1f}")
+    if state.metabolism:
+        m = state.metabolism
         lines.append(f"Metabolism: glycogen={m['glycogen']} fat={m['fat_storage']} protein={m['protein_use']} added={m['energy_added']} total={m['total_energy']}")
     lines.append("Controls: p pause/resume | n skip stage | + / - stress | t / g temp up/down | o toggle obesity | m toggle malabsorption | a toggle antibiotic | q quit")
     return "\n".join(lines)
 
 
-def _hormones_table_markup(body: Body) -> Table:
-    t = Table(show_header=False, box=SIMPLE)
-    t.add_column("h", ratio=1)
-    t.add_column("v", ratio=2)
-    for k, v in body.hormones.items():
-        t.add_row(k, v)
+def _hormones_table_markup(t: Table, hormones: Tuple[Tuple[str, str], ...], prev: Dict[str, str]) -> Table: # type: ignore
+    # rewrite only the hormone rows whose level changed since the previous frame
+    names, levels = t.columns[0]._cells, t.columns[1]._cells
+    for i, (k, v) in enumerate(hormones):
+        if i >= t.row_count:
+            t.add_row(k, v)
+        elif prev.get(k) != v:
+            names[i] = k
+            levels[i] = v
+        prev[k] = v
     return t
 
 
-def render_rich_status(body: Body, spinner_frame: int, progress: Progress, progress_task_id: Optional[int]) -> Panel: # type: ignore
-    # Build a two-column layout with organ/hormone info and controls
-    table = Table.grid(expand=True)
-    table.add_column(ratio=2)
-    table.add_column(ratio=3)
-
-    left = Table.grid()
-    left.add_row("Stage", str(body.stage))
-    left.add_row("Ticks (stage)", str(body.ticks))
-    left.add_row("Ticks (total)", str(body.total_ticks))
-    left.add_row("Temperature C", f"{body.env.temperature_c:.1f}")
-    left.add_row("Stress Level", str(body.env.stress_level))
-    left.add_row("Active Conditions", ', '.join(body.cond.active()) or 'none')
-    left.add_row("Energy kcal", f"{round(body.energy,2)}")
-    left.add_row("Microbiome Good/Bad %", f"{body.microbiome.good_bacteria:.1f} / {body.microbiome.bad_bacteria:.1f}")
-    left.add_row("Fiber Intake (g)", f"{body.microbiome.fiber_intake:.1f}")
-    left.add_row("Gas Production", f"{body.microbiome.gas_production()}")
-
-    right = Table.grid()
-    hormones_table = _hormones_table_markup(body)
-    right.add_row(hormones_table)
-
-    if body.food:
-        food_table = Table(title="Food", show_header=False, box=SIMPLE)
-        food_table.add_row("Name", body.food.name)
-        food_table.add_row("Carbs (g)", f"{body.food.carbs:.1f}")
-        food_table.add_row("Proteins (g)", f"{body.food.proteins:.1f}")
-        food_table.add_row("Fats (g)", f"{body.food.fats:.1f}")
-        food_table.add_row("Fiber (g)", f"{body.food.fiber:.1f}")
-        right.add_row(food_table)
-
-    table.add_row(left, right)
-
-    spinner_frames = ['|', '/', '-', '\\']
-    spinner = spinner_frames[spinner_frame % len(spinner_frames)]
-    controls = "[p] pause/resume  [n] skip stage  [+/-] stress  [t/g] temp up/down  [o] toggle obesity  [m] toggle malabsorption  [a] toggle antibiotic  [q] quit"
-
-    # Compose a layout where the progress bar is shown under the main table
-    layout = Layout()
-    layout.split_column(
-        Layout(name="main", ratio=3),
-        Layout(name="progress", ratio=1)
-    )
-    layout['main'].update(Panel(table, title=f"Digestive Simulation  {spinner}"))
-
-    if progress_task_id is not None:
-        # render progress with an explanatory panel
-        progress_panel = Panel(Align.center(progress), title="Organ Progress", padding=(1, 1))
-        layout['progress'].update(progress_panel)
-    else:
-        layout['progress'].update(Panel("No active progress", title="Organ Progress", padding=(1, 1)))
-
-    # final wrapper
-    wrapper = Panel(layout, title="Digestive Simulation Dashboard", subtitle=controls)
-    return wrapper
+_LEFT_ROWS = ("Stage", "Ticks (stage)", "Ticks (total)", "Temperature C", "Stress Level", "Active Conditions",
+              "Energy kcal", "Microbiome Good/Bad %", "Fiber Intake (g)", "Gas Production")
+_FOOD_ROWS = ("Name", "Carbs (g)", "Proteins (g)", "Fats (g)", "Fiber (g)")
+_SPINNER = ('|', '/', '-', '\\')  # 4 frames, indexed with `& 3`
+_CONTROLS = "[p] pause/resume  [n] skip stage  [+/-] stress  [t/g] temp up/down  [o] toggle obesity  [m] toggle malabsorption  [a] toggle antibiotic  [q] quit"
+
+
+class _RichUI:
+    # Dashboard renderables built once; each frame only rewrites cell strings
+    # (and swaps the right-hand grid when food appears/disappears).
+    def __init__(self, progress: Progress, progress_task_id: Optional[int]): # type: ignore
+        self.left_table = Table.grid()
+        for label in _LEFT_ROWS:
+            self.left_table.add_row(label, "")
+
+        self.hormones_table = Table(show_header=False, box=SIMPLE)
+        self.hormones_table.add_column("h", ratio=1)
+        self.hormones_table.add_column("v", ratio=2)
+        self.prev_hormones: Dict[str, str] = {}
+        self._last_hormones_ver = -1
+
+        self.food_table = Table(title="Food", show_header=False, box=SIMPLE)
+        for label in _FOOD_ROWS:
+            self.food_table.add_row(label, "")
+
+        # two variants of the right column, with and without the food table
+        self.right_table = Table.grid()
+        self.right_table.add_row(self.hormones_table)
+        self.right_food_table = Table.grid()
+        self.right_food_table.add_row(self.hormones_table)
+        self.right_food_table.add_row(self.food_table)
+
+        # Build a two-column layout with organ/hormone info and controls
+        self.table = Table.grid(expand=True)
+        self.table.add_column(ratio=2)
+        self.table.add_column(ratio=3)
+        self.table.add_row(self.left_table, self.right_table)
+        self.main_panel = Panel(self.table, title="Digestive Simulation")
+
+        # Progress bar shown under the main table. A Group renders at its natural
+        # height: Live runs inline (screen=False), where a full-height Layout gets cropped
+        if progress_task_id is not None:
+            # render progress with an explanatory panel
+            progress_panel = Panel(Align.center(progress), title="Organ Progress", padding=(1, 1))
+        else:
+            progress_panel = Panel("No active progress", title="Organ Progress", padding=(1, 1))
+
+        # final wrapper
+        self.wrapper = Panel(Group(self.main_panel, progress_panel),
+                             title="Digestive Simulation Dashboard", subtitle=_CONTROLS)
+
+    def update(self, state: SimState, spinner: str) -> Panel: # type: ignore
+        cells = self.left_table.columns[1]._cells
+        cells[0] = str(state.stage)
+        cells[1] = str(state.ticks)
+        cells[2] = str(state.total_ticks)
+        cells[3] = f"{state.temperature_c:.1f}"
+        cells[4] = str(state.stress_level)
+        cells[5] = state.conditions
+        cells[6] = f"{round(state.energy,2)}"
+        cells[7] = f"{state.good_bacteria:.1f} / {state.bad_bacteria:.1f}"
+        cells[8] = f"{state.fiber_intake:.1f}"
+        cells[9] = f"{state.gas}"
+
+        if state.hormones_version != self._last_hormones_ver:
+            _hormones_table_markup(self.hormones_table, state.hormones, self.prev_hormones)
+            self._last_hormones_ver = state.hormones_version
+
+        food = state.food
+        if food:
+            cells = self.food_table.columns[1]._cells
+            cells[0] = food.name
+            cells[1] = f"{food.carbs:.1f}"
+            cells[2] = f"{food.proteins:.1f}"
+            cells[3] = f"{food.fats:.1f}"
+            cells[4] = f"{food.fiber:.1f}"
+        self.table.columns[1]._cells[0] = self.right_food_table if food else self.right_table
+
+        self.main_panel.title = f"Digestive Simulation  {spinner}"
+        return self.wrapper
+
+
+def render_rich_status(ui: _RichUI, state: SimState, spinner_frame: int) -> Panel: # type: ignore
+    spinner = _SPINNER[spinner_frame & 3]
+    return ui.update(state, spinner)
 
 
 # ---- Main loop ----
-def main_loop():
+MENU = (
+    Food("Burger & Fries", carbs=60.0, proteins=30.0, fats=35.0, fiber=4.0),
+    Food("Salad", carbs=15.0, proteins=5.0, fats=10.0, fiber=8.0),
+    Food("Pasta", carbs=70.0, proteins=20.0, fats=10.0, fiber=3.0),
+    Food("Steak", carbs=0.0, proteins=50.0, fats=20.0, fiber=0.0)
+)
+
+
+def run_batch(n: int) -> None:
+    # Headless: n bodies, menu items assigned round-robin, ticked as fast as possible
+    batch = BodyBatch(n, Environment(temperature_c=37.0, stress_level=2), Conditions())
+    batch.eat([MENU[i % len(MENU)] for i in range(n)])
+    start = time.perf_counter()
+    while not batch.done:
+        batch.tick()
+    elapsed = max(time.perf_counter() - start, 1e-9)
+    print(f"Simulated {n} bodies for {batch.total_ticks} ticks in {elapsed:.3f}s "
+          f"({n * batch.total_ticks / elapsed:,.0f} body-ticks/s)")
+    print(f"Mean energy gained: {batch.energy.mean():.2f} kcal")
+
+
+def main_loop(tick_rate: float = 1.0):
     if Console is None:
         print("Warning: rich not available. Install rich for better UI: pip install rich")
     console = Console() if Console else None
@@ -516,22 +1276,20 @@ def main_loop():
     env = Environment(temperature_c=37.0, stress_level=2)
     cond = Conditions()
 
-    foods = [
-        Food("Burger & Fries", carbs=60.0, proteins=30.0, fats=35.0, fiber=4.0),
-        Food("Salad", carbs=15.0, proteins=5.0, fats=10.0, fiber=8.0),
-        Food("Pasta", carbs=70.0, proteins=20.0, fats=10.0, fiber=3.0),
-        Food("Steak", carbs=0.0, proteins=50.0, fats=20.0, fiber=0.0)
-    ]
+    foods = MENU
 
     body = Body(env, cond)
 
-    # command queue and input thread
-    cmd_q = queue.Queue()
     stop_event = threading.Event()
-    t = threading.Thread(target=input_listener, args=(cmd_q, stop_event), daemon=True)
-    t.start()
 
-    paused = False
+    # Two-stage pipeline: the simulation thread ticks `body` and pushes snapshots,
+    # this (main) thread renders them. The bounded queue is the only shared state,
+    # so tick N+1 is computed while frame N is being drawn.
+    state_q: queue.Queue = queue.Queue(maxsize=2)
+    sim_thread: Optional[threading.Thread] = None
+    # one reader for the menu and the simulation, so typed-ahead commands carry over
+    commands = CommandReader()
+
     spinner_idx = 0
 
     try:
@@ -539,7 +1297,8 @@ def main_loop():
         for i, f in enumerate(foods, 1):
             print(f"{i}. {f.name} (Carbs: {f.carbs}g, Proteins: {f.proteins}g, Fats: {f.fats}g, Fiber: {f.fiber}g)")
         while True:
-            choice = input("Enter number: ").strip().lower()
+            choice = commands.readline("Enter number: ")
+            choice = 'q' if choice is None else choice.strip().lower()
             if choice == 'q':
                 stop_event.set()
                 return
@@ -549,164 +1308,94 @@ def main_loop():
             print("Invalid input")
 
         body.eat(chosen)
+        initial_state = SimState.capture(body)
+
+        sim_thread = threading.Thread(target=simulate, args=(body, state_q, stop_event, tick_rate, commands), daemon=True)
+        sim_thread.start()
 
         # Create a single Progress instance and a single Live instance to update in-place
         progress = Progress(SpinnerColumn(), TextColumn("{task.description}"), BarColumn(), TimeElapsedColumn()) if Progress else None
         progress_task_id = None
 
         if Live and Console and progress:
-            # start progress
-            progress.start()
+            # The progress bar is only drawn as part of our panel (it is never
+            # started, so it has no live display or refresh thread of its own).
             # We'll add a task and update its total when a new organ timer is set
             progress_task_id = progress.add_task("idle", total=1)
+            # one dashboard per run, so no state leaks into a later main_loop()/Body
+            ui = _RichUI(progress, progress_task_id)
 
-            with Live(render_rich_status(body, spinner_idx, progress, progress_task_id), refresh_per_second=4, console=console, screen=True) as live:
-                # main update loop - we will update the live panel in-place
+            # No auto refresh: the terminal is redrawn once per published snapshot
+            with Live(render_rich_status(ui, initial_state, spinner_idx),
+                      auto_refresh=False, refresh_per_second=1, console=console, screen=False) as live:
+                # render stage - the only thread that touches `live` and `progress`
                 while True:
-                    # handle commands
-                    while not cmd_q.empty():
-                        cmd = cmd_q.get().strip().lower()
-                        if cmd == 'p':
-                            paused = not paused
-                        elif cmd == 'n':
-                            # skip current and future timers
-                            body.stomach.timer = 0
-                            body.duodenum.timer = 0
-                            body.small_intestine.timer = 0
-                            body.large_intestine.timer = 0
-                        elif cmd == '+':
-                            body.env.stress_level = min(10, body.env.stress_level + 1)
-                        elif cmd == '-':
-                            body.env.stress_level = max(0, body.env.stress_level - 1)
-                        elif cmd == 't':
-                            body.env.temperature_c += 0.5
-                        elif cmd == 'g':
-                            body.env.temperature_c -= 0.5
-                        elif cmd == 'o':
-                            body.cond.obesity = not body.cond.obesity
-                        elif cmd == 'm':
-                            body.cond.malabsorption = not body.cond.malabsorption
-                        elif cmd == 'a':
-                            body.microbiome.antibiotic = not body.microbiome.antibiotic
-                        elif cmd == 'q':
-                            stop_event.set()
-                            raise KeyboardInterrupt
-
-                    if not paused:
-                        # Before ticking, possibly set progress task to current organ timer
-                        # Determine current organ remaining ticks to show
-                        organ_remaining = None
-                        organ_total = None
-                        desc = "idle"
-                        if body.stage == 'stomach':
-                            # If digestion hasn't started yet, compute will set timer on start_digestion
-                            if body.stomach.timer > 0:
-                                organ_remaining = body.stomach.timer
-                                organ_total = body.stomach.base_timer
-                                desc = 'Stomach'
-                        elif body.stage == 'duodenum':
-                            organ_remaining = body.duodenum.timer
-                            organ_total = TIME_MAP['Duodenum']
-                            desc = 'Duodenum'
-                        elif body.stage == 'small_intestine':
-                            organ_remaining = body.small_intestine.timer
-                            organ_total = body.small_intestine.base_timer
-                            desc = 'Small Intestine'
-                        elif body.stage == 'large_intestine':
-                            organ_remaining = body.large_intestine.timer
-                            organ_total = TIME_MAP['LargeIntestine']
-                            desc = 'Large Intestine'
-                        else:
-                            organ_remaining = None
-
-                        # Update progress bar if reasonable
-                        if progress and progress_task_id is not None:
-                            try:
-                                if organ_total and organ_total > 0:
-                                    progress.update(progress_task_id, total=organ_total, completed=max(0, organ_total - (organ_remaining or 0)), description=desc)
-                                else:
-                                    progress.update(progress_task_id, total=1, completed=1, description=desc)
-                            except Exception:
-                                # progress may be stopped or finished; ignore update errors
-                                pass
-
-                        body.tick()
+                    state = state_q.get()
+                    if state is None:
+                        break
+
+                    # Update progress bar if reasonable
+                    try:
+                        progress.update(progress_task_id, total=state.progress_total, completed=state.progress_completed, description=state.progress_desc)
+                    except Exception:
+                        # progress may be stopped or finished; ignore update errors
+                        pass
 
                     spinner_idx += 1
 
                     # update live view (single panel edit)
-                    live.update(render_rich_status(body, spinner_idx, progress, progress_task_id))
+                    live.update(render_rich_status(ui, state, spinner_idx))
+                    live.refresh()
 
                     # stop when digestion returned idle and no food
-                    if body.stage == 'idle' and body.food is None:
-                        console.print(f"Digestion complete. Total energy gained: {round(body.energy,2)} kcal")
+                    if state.done:
+                        console.print(f"Digestion complete. Total energy gained: {round(state.energy,2)} kcal")
                         time.sleep(1.2)
                         break
 
-                    time.sleep(1)
-
-                # end with: stop progress safely
-                try:
-                    progress.stop()
-                except Exception:
-                    pass
-
         else:
             # Fallback non-rich loop: prints single updatable text region by clearing screen
             while True:
-                while not cmd_q.empty():
-                    cmd = cmd_q.get().strip().lower()
-                    if cmd == 'p':
-                        paused = not paused
-                    elif cmd == 'n':
-                        body.stomach.timer = 0
-                        body.duodenum.timer = 0
-                        body.small_intestine.timer = 0
-                        body.large_intestine.timer = 0
-                    elif cmd == '+':
-                        body.env.stress_level = min(10, body.env.stress_level + 1)
-                    elif cmd == '-':
-                        body.env.stress_level = max(0, body.env.stress_level - 1)
-                    elif cmd == 't':
-                        body.env.temperature_c += 0.5
-                    elif cmd == 'g':
-                        body.env.temperature_c -= 0.5
-                    elif cmd == 'o':
-                        body.cond.obesity = not body.cond.obesity
-                    elif cmd == 'm':
-                        body.cond.malabsorption = not body.cond.malabsorption
-                    elif cmd == 'a':
-                        body.microbiome.antibiotic = not body.microbiome.antibiotic
-                    elif cmd == 'q':
-                        stop_event.set()
-                        raise KeyboardInterrupt
-
-                if not paused:
-                    body.tick()
+                state = state_q.get()
+                if state is None:
+                    break
 
-                spinner_frames = ['|', '/', '-', '\\']
-                spinner = spinner_frames[spinner_idx % len(spinner_frames)]
-                sys.stdout.write('\x1b[2J\x1b[H')  # clear terminal (ansi)
-                print(render_plain_status(body, spinner))
+                spinner = _SPINNER[spinner_idx & 3]
+                # one write + flush per frame: clear terminal (ansi) and draw the status
+                sys.stdout.write('\x1b[2J\x1b[H' + render_plain_status(state, spinner) + '\n')
+                sys.stdout.flush()
 
-                if body.stage == 'idle' and body.food is None:
-                    print(f"Digestion complete. Total energy gained: {round(body.energy,2)} kcal")
+                if state.done:
+                    print(f"Digestion complete. Total energy gained: {round(state.energy,2)} kcal")
                     time.sleep(1.2)
                     break
 
                 spinner_idx += 1
-                time.sleep(1)
 
     except KeyboardInterrupt:
         pass
     finally:
         stop_event.set()
-        try:
-            t.join(timeout=0.5)
-        except Exception:
-            pass
+        if sim_thread is not None:
+            try:
+                sim_thread.join(timeout=0.5)
+            except Exception:
+                pass
         print("Exiting simulation. Goodbye.")
 
 
 if __name__ == '__main__':
-    main_loop()
\ No newline at end of file
+    parser = argparse.ArgumentParser(description="Interactive digestive system simulation")
+    parser.add_argument('--tick-rate', type=float, default=1.0,
+                        help="simulation ticks per second; 0 runs as fast as possible (default: 1)")
+    parser.add_argument('--batch', type=int, metavar='N',
+                        help="simulate N bodies headless (no UI) and report throughput")
+    args = parser.parse_args()
+    if args.tick_rate < 0:
+        parser.error("--tick-rate must be >= 0")
+    if args.batch is not None:
+        if args.batch < 1:
+            parser.error("--batch must be >= 1")
+        run_batch(args.batch)
+    else:
+        main_loop(tick_rate=args.tick_rate)
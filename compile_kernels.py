@@ -0,0 +1,35 @@
+"""Ahead-of-time compile GutFlow's numeric kernels into the gutflow_kernels extension.
+
+Run once after installing numba (``python compile_kernels.py``); GutFlow.py imports the
+resulting module when present and skips JIT compilation at startup. The build records
+GutFlow.KERNEL_FINGERPRINT: after the kernels or their constants change, GutFlow.py
+warns and falls back to the JIT until this script is run again. Delete the built
+``gutflow_kernels.*`` file to go back to the JIT path.
+"""
+import os
+import sys
+
+from numba.pycc import CC
+
+# Always build from the Python sources, never from a previously built extension
+sys.modules['gutflow_kernels'] = None
+import GutFlow  # noqa: E402
+
+KERNEL_FINGERPRINT = GutFlow.KERNEL_FINGERPRINT
+
+cc = CC('gutflow_kernels')
+cc.output_dir = os.path.dirname(os.path.abspath(__file__))
+
+for name, signature in GutFlow.KERNEL_SIGNATURES.items():
+    kernel = getattr(GutFlow, name)
+    cc.export(name.lstrip('_'), signature)(getattr(kernel, 'py_func', kernel))
+
+
+@cc.export('fingerprint', 'i8()')
+def fingerprint():
+    # the KERNEL_FINGERPRINT this extension was built from, folded in as a constant
+    return KERNEL_FINGERPRINT
+
+
+if __name__ == '__main__':
+    cc.compile()
@@ -0,0 +1,56 @@
+import itertools
+
+import numpy as np
+import pytest
+
+import GutFlow as G
+
+MAX_TICKS = 200
+CONDITIONS = (
+    {},
+    {'gastroparesis': True, 'gerd': True},
+    {'malabsorption': True, 'diabetes': True},
+    {'obesity': True},
+)
+
+
+def batch_matches(body, batch, i):
+    timers = (body.stomach.timer, body.duodenum.timer, body.small_intestine.timer, body.large_intestine.timer)
+    food = body.food
+    return (G.STAGES[batch.stage[i]] == body.stage and body.ticks == batch.ticks[i]
+            and tuple(getattr(body.hormones, name) for name in G.HORMONE_NAMES) == tuple(batch.hormones[i])
+            and timers == tuple(batch.timers[i]) and body.hunger_level == batch.hunger[i]
+            and body.energy == batch.energy[i]
+            and body.microbiome.good_bacteria == batch.good[i] and body.microbiome.bad_bacteria == batch.bad[i]
+            and (food is not None) == batch.has_food[i]
+            and (food is None or np.array_equal(food.nutrients, batch.nutrients[i])))
+
+
+@pytest.mark.parametrize('flags, stress, temp, skip_at',
+                         list(itertools.product(CONDITIONS, (2, 7), (35.5, 37.0, 38.5), (None, 5))))
+def test_batch_matches_body_every_tick(flags, stress, temp, skip_at):
+    # BodyBatch re-implements Body.tick with array ops; step both through every menu
+    # item, with and without antibiotics, and compare the full state on every tick
+    env = G.Environment(temperature_c=temp, stress_level=stress)
+    cond = G.Conditions(**flags)
+    n = 2 * len(G.MENU)
+    bodies = [G.Body(env, cond) for _ in range(n)]
+    batch = G.BodyBatch(n, env, cond)
+    foods = [G.MENU[i % len(G.MENU)] for i in range(n)]
+    for i, body in enumerate(bodies):
+        body.microbiome.antibiotic = batch.antibiotic[i] = i >= len(G.MENU)
+        body.eat(foods[i])
+    batch.eat(foods)
+    for t in range(MAX_TICKS):
+        if t == skip_at:
+            for body in bodies:
+                body.skip_current_stage()
+            batch.skip_current_stage()
+        for body in bodies:
+            body.tick()
+        batch.tick()
+        diverged = [i for i, body in enumerate(bodies) if not batch_matches(body, batch, i)]
+        assert not diverged, f'bodies {diverged} diverged at tick {t + 1}'
+        if batch.done:
+            break
+    assert batch.done
@@ -0,0 +1,56 @@
+import os
+import sys
+
+import pytest
+
+import GutFlow as G
+
+pytestmark = pytest.mark.skipif(G.msvcrt is not None, reason='POSIX stdin path only')
+
+
+@pytest.fixture
+def stdin_pipe(monkeypatch):
+    read_fd, write_fd = os.pipe()
+    stdin = os.fdopen(read_fd, 'r')
+    monkeypatch.setattr(sys, 'stdin', stdin)
+    yield write_fd
+    stdin.close()
+    try:
+        os.close(write_fd)
+    except OSError:
+        pass
+
+
+def test_poll_returns_only_complete_lines(stdin_pipe):
+    reader = G.CommandReader()
+    os.write(stdin_pipe, b'1\nQ\n\npart')
+    assert reader.poll() == ['1', 'q']
+    assert reader.poll() == []
+    os.write(stdin_pipe, b'ial\n')
+    assert reader.poll() == ['partial']
+    assert not reader.closed
+
+
+def test_poll_flushes_unterminated_line_at_eof(stdin_pipe):
+    reader = G.CommandReader()
+    os.write(stdin_pipe, b'p\nn')
+    os.close(stdin_pipe)
+    assert reader.poll() == ['p', 'n']
+    assert reader.closed
+    assert reader.poll() == []
+
+
+def test_readline_shares_buffer_with_poll(stdin_pipe, capsys):
+    reader = G.CommandReader()
+    os.write(stdin_pipe, b'2\nq\n')
+    assert reader.readline('Enter number: ') == '2'
+    assert capsys.readouterr().out == 'Enter number: '
+    # the command typed ahead of the menu answer is still delivered
+    assert reader.poll() == ['q']
+
+
+def test_readline_returns_none_at_eof(stdin_pipe):
+    reader = G.CommandReader()
+    os.close(stdin_pipe)
+    assert reader.readline() is None
+    assert reader.closed
@@ -0,0 +1,33 @@
+import pytest
+
+import GutFlow as G
+
+
+def test_constructor_accepts_booleans_and_flags():
+    assert G.Conditions().flags == 0
+    assert G.Conditions(diabetes=True).flags == G.FLAG_DIABETES
+    assert G.Conditions(True, True).flags == G.FLAG_GASTROPARESIS | G.FLAG_GERD
+    assert G.Conditions(obesity=True, flags=G.FLAG_GERD).flags == G.FLAG_GERD | G.FLAG_OBESITY
+
+
+def test_repr_lists_active_conditions():
+    assert repr(G.Conditions()) == 'Conditions()'
+    assert repr(G.Conditions(gerd=True, obesity=True)) == 'Conditions(gerd=True, obesity=True)'
+
+
+def test_equality_compares_masks():
+    assert G.Conditions(diabetes=True) == G.Conditions(flags=G.FLAG_DIABETES)
+    assert G.Conditions(diabetes=True) != G.Conditions(obesity=True)
+    with pytest.raises(TypeError):
+        hash(G.Conditions())
+
+
+def test_properties_and_toggle_refresh_active_str():
+    cond = G.Conditions()
+    assert cond.active_str == 'none'
+    cond.malabsorption = True
+    assert cond.malabsorption and cond.active() == ['malabsorption']
+    cond.toggle(G.FLAG_OBESITY)
+    assert cond.active_str == 'malabsorption, obesity'
+    cond.malabsorption = False
+    assert cond.active_str == 'obesity'
@@ -0,0 +1,33 @@
+import dataclasses
+
+import numpy as np
+import pytest
+
+import GutFlow as G
+
+
+def test_constructor_builds_read_only_vector():
+    food = G.Food('Salad', 15.0, 5.0, 10.0, 8.0)
+    assert food.nutrients.dtype == np.float64
+    assert (food.carbs, food.proteins, food.fats, food.fiber) == (15.0, 5.0, 10.0, 8.0)
+    with pytest.raises(ValueError):
+        food.nutrients[G.CARBS] = 0.0
+    with pytest.raises(dataclasses.FrozenInstanceError):
+        food.name = 'Soup'
+
+
+def test_equality_and_hash_follow_values():
+    food = G.Food('Salad', 15.0, 5.0, 10.0, 8.0)
+    same = G.Food('Salad', carbs=15, proteins=5, fats=10, fiber=8)
+    assert food == same and hash(food) == hash(same)
+    assert food != G.Food('Salad', 15.0, 5.0, 10.0, 7.0)
+    assert food != G.Food('Soup', 15.0, 5.0, 10.0, 8.0)
+
+
+def test_replace_adopts_float64_vector_without_copying():
+    food = G.Food('Salad', 15.0, 5.0, 10.0, 8.0)
+    nutrients = food.nutrients.copy()
+    nutrients[G.CARBS] = 1.0
+    changed = dataclasses.replace(food, nutrients=nutrients)
+    assert changed.nutrients is nutrients
+    assert changed.carbs == 1.0 and food.carbs == 15.0
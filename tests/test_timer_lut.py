@@ -0,0 +1,49 @@
+import itertools
+
+import GutFlow as G
+
+# One representative temperature per bucket: normal, below 36C, above 38C
+TEMPS = (37.0, 35.5, 38.5)
+
+
+def original_timer(gastrin, ghrelin, stress_level, temp, gastroparesis, gerd):
+    # Stomach.start_digestion before the lookup table, kept verbatim
+    gastrin_factor = 1.0
+    if gastrin == G.H.HIGH:
+        gastrin_factor = 1.3
+    elif gastrin == G.H.LOW:
+        gastrin_factor = 0.75
+    stress_factor = 1.0 if stress_level < 6 else 0.85
+    temp_factor = 1.0
+    if temp < 36.0:
+        temp_factor = 0.9
+    elif temp > 38.0:
+        temp_factor = 1.05
+    disease_factor = 1.0
+    if gastroparesis:
+        disease_factor *= 1.8
+    if gerd:
+        disease_factor *= 1.05
+    hunger_factor = 0.9 if ghrelin == G.H.HIGH else 1.0
+    base_timer = G.TIME_MAP['Stomach']
+    return max(2, int(base_timer / (gastrin_factor * temp_factor * hunger_factor) * disease_factor / stress_factor))
+
+
+def test_lut_covers_every_input_combination():
+    assert len(G._TIMER_LUT) == len(G.H) * 2 * 2 * len(TEMPS) * 2 * 2
+
+
+def test_lut_matches_original_expression():
+    for gastrin, ghrelin, stress_level, temp_bucket, gastroparesis, gerd in itertools.product(
+            G.H, G.H, (0, 6), range(len(TEMPS)), (False, True), (False, True)):
+        key = G._timer_key(gastrin, ghrelin == G.H.HIGH, stress_level >= 6, temp_bucket, gastroparesis, gerd)
+        expected = original_timer(gastrin, ghrelin, stress_level, TEMPS[temp_bucket], gastroparesis, gerd)
+        assert G._TIMER_LUT[key] == expected, (gastrin, ghrelin, stress_level, temp_bucket, gastroparesis, gerd)
+
+
+def test_stomach_uses_lut_timer():
+    env = G.Environment(temperature_c=35.5, stress_level=7)
+    body = G.Body(env, G.Conditions(gastroparesis=True))
+    body.hormones.gastrin = G.H.HIGH
+    info = body.stomach.start_digestion(G.Food('Salad', 15.0, 5.0, 10.0, 8.0), body.hormones, body.cond, env)
+    assert info['timer'] == original_timer(G.H.HIGH, G.H.NORMAL, 7, 35.5, True, False)